@@ -1,11 +1,13 @@
 import os
-import json
 import hmac
 import hashlib
 import logging
+import re
+from functools import lru_cache
 from fastapi import FastAPI, Request, BackgroundTasks, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 from api.web_hook.models.github_events import GithubPushEvent
 from api.web_hook.services.wiki_generator import generate_wiki_for_repository
 
@@ -27,6 +29,17 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Hex form of a SHA-256 digest as sent in X-Hub-Signature-256
+_SIGNATURE_HEX = re.compile(r"[0-9a-f]{64}")
+
+@lru_cache(maxsize=8)
+def _hmac_prototype(secret: str):
+    """
+    Keyed HMAC-SHA256 object for a webhook secret, built once per secret.
+    Callers must copy() it before update() so the shared key schedule stays untouched.
+    """
+    return hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+
 @app.post("/webhook")
 async def github_webhook(request: Request, background_tasks: BackgroundTasks):
     """
@@ -39,8 +52,7 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
         A 202 Accepted response indicating the webhook was received and processing has started
     """
     try:
-        # Parse the webhook payload
-        payload = await request.json()
+        # Read the raw payload; it is parsed only after its signature checks out
         body = await request.body()
         # Extract GitHub event type from headers
         github_event_type = request.headers.get("X-GitHub-Event")
@@ -60,15 +72,29 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
             # It's better to return a generic error to the client for security reasons
             raise HTTPException(status_code=500, detail="Webhook secret not configured")
 
-        hash_object = hmac.new(secret.encode('utf-8'), msg=body, digestmod=hashlib.sha256)
-        expected_signature = "sha256=" + hash_object.hexdigest()
-        if not hmac.compare_digest(expected_signature, signature):
+        hash_object = _hmac_prototype(secret).copy()
+        hash_object.update(body)
+        # Compare raw digests rather than hex strings. Only exactly 64 lowercase hex characters are
+        # decoded, as GitHub sends them; fromhex alone would also accept whitespace and uppercase.
+        algorithm, _, signature_hex = signature.partition("=")
+        if algorithm == "sha256" and _SIGNATURE_HEX.fullmatch(signature_hex):
+            provided_digest = bytes.fromhex(signature_hex)
+        else:
+            provided_digest = b""
+        if not hmac.compare_digest(hash_object.digest(), provided_digest):
             logger.error(f"Request signatures didn't match!")
             raise HTTPException(status_code=403, detail="Request signatures didn't match!")
 
         # Assuming GithubPushEvent is the correct model for 'pull_request' events as well based on previous context
         # If not, this might need adjustment or a more generic event parsing.
-        github_push_event = GithubPushEvent(**payload)
+        # Parse and validate straight from the raw bytes in one pass
+        try:
+            github_push_event = GithubPushEvent.model_validate_json(body)
+        except ValidationError as ve:
+            if any(error["type"] == "json_invalid" for error in ve.errors()):
+                logger.error("Invalid JSON in webhook payload")
+                raise HTTPException(status_code=400, detail="Invalid JSON in webhook payload")
+            raise
 
         if github_event_type == "pull_request" and \
            github_push_event.action == "closed" and \
@@ -94,9 +120,6 @@ async def github_webhook(request: Request, background_tasks: BackgroundTasks):
                 status_code=202, # Acknowledge other events but don't process
                 content={"message": "Webhook received, but event type or action is not configured for processing."}
             )
-    except json.JSONDecodeError:
-        logger.error("Invalid JSON in webhook payload")
-        raise HTTPException(status_code=400, detail="Invalid JSON in webhook payload")
     except HTTPException as he:
         # Re-raise HTTPExceptions to let FastAPI handle them
         raise he
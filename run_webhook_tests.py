@@ -2,13 +2,57 @@
 """
 Test runner script for webhook_autodoc project.
 Run this script to execute all tests for the github_webhook function.
+Test files are distributed across CPU cores with pytest-xdist.
+Extra arguments are passed through to pytest, e.g. `--cov=api` to collect coverage on demand.
+
+Run `python run_webhook_tests.py --benchmark` to time the /webhook latency benchmark instead.
+pytest-benchmark switches itself off under xdist, so this mode runs serially. It compares against
+this machine's pinned baseline and fails if the median latency is more than BENCHMARK_MAX_REGRESSION
+slower; nothing is saved. Record or refresh the baseline explicitly with
+`python run_webhook_tests.py --benchmark-save-baseline`.
 """
 import subprocess
 import sys
 import os
 from pathlib import Path
 
-def run_tests():
+# Allowed slowdown of the median /webhook latency against the pinned baseline; the median
+# rather than the mean, since a sub-millisecond call has outliers tens of times slower
+BENCHMARK_MAX_REGRESSION = "median:10%"
+# Name the baseline run is saved under, in .benchmarks/<machine id>/NNNN_<name>.json
+BENCHMARK_BASELINE = "webhook-baseline"
+
+def find_benchmark_baseline(project_root):
+    """Latest pinned baseline recorded on this machine, or None; other machines' runs are not comparable."""
+    from pytest_benchmark.utils import get_machine_id
+
+    baselines = sorted(project_root.glob(f".benchmarks/{get_machine_id()}/*_{BENCHMARK_BASELINE}.json"))
+    return baselines[-1] if baselines else None
+
+def benchmark_args(project_root, save_baseline=False):
+    """
+    pytest arguments for a serial benchmark run.
+    Args:
+        project_root: Directory holding .benchmarks/
+        save_baseline: Record this run as the new baseline instead of gating against the current one
+    Returns:
+        The arguments, or None if there is no baseline to gate against
+    """
+    args = [
+        "test/github_api_test.py",
+        "-p", "no:xdist",  # pytest-benchmark disables itself under xdist
+        "--benchmark-only",
+    ]
+    if save_baseline:
+        return args + [f"--benchmark-save={BENCHMARK_BASELINE}"]
+
+    baseline = find_benchmark_baseline(project_root)
+    if baseline is None:
+        return None
+    # The exact file is named so a later run can never replace the baseline it is judged against
+    return args + [f"--benchmark-compare={baseline}", f"--benchmark-compare-fail={BENCHMARK_MAX_REGRESSION}"]
+
+def run_tests(extra_args=()):
     """Run the test suite for github_webhook function."""
     
     # Ensure we're in the project root directory
@@ -18,14 +62,36 @@ def run_tests():
     # Set up environment variables for testing
     os.environ["Github_WEBHOOK_SECRET"] = "test_secret"
     
+    benchmark_modes = {"--benchmark", "--benchmark-save-baseline"}
+    if benchmark_modes.intersection(extra_args):
+        save_baseline = "--benchmark-save-baseline" in extra_args
+        extra_args = [arg for arg in extra_args if arg not in benchmark_modes]
+        try:
+            target_args = benchmark_args(project_root, save_baseline=save_baseline)
+        except ImportError:
+            print("❌ pytest-benchmark not found. Please install it:")
+            print("   pip install pytest-benchmark")
+            return 1
+        if target_args is None:
+            print("❌ No benchmark baseline recorded on this machine. Record one first with:")
+            print("   python run_webhook_tests.py --benchmark-save-baseline")
+            return 1
+    else:
+        target_args = [
+            "test",
+            "-n", "auto",  # One pytest-xdist worker per CPU core
+            "--dist", "loadfile",  # Keep each test file's module fixtures on a single worker
+        ]
+
     # Run pytest with verbose output
     cmd = [
         sys.executable, "-m", "pytest", 
-        "test/api/web_hook/test_app.py",
+        *target_args,
         "-v",  # Verbose output
         "--tb=short",  # Short traceback format
         "--color=yes",  # Colored output
         "-x",  # Stop on first failure
+        *extra_args,
     ]
     
     print("Running tests for github_webhook function...")
@@ -43,9 +109,9 @@ def run_tests():
         return e.returncode
     except FileNotFoundError:
         print("❌ pytest not found. Please install pytest:")
-        print("   pip install pytest pytest-asyncio")
+        print("   pip install pytest pytest-asyncio pytest-xdist")
         return 1
 
 if __name__ == "__main__":
-    exit_code = run_tests()
+    exit_code = run_tests(sys.argv[1:])
     sys.exit(exit_code)
@@ -1,25 +1,30 @@
 import pytest
 import json
 import hmac
-import hashlib
-import os
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import HTTPException, BackgroundTasks
-from fastapi.testclient import TestClient
-from api.web_hook.app import app, github_webhook
+from api.web_hook.app import github_webhook
 from api.web_hook.models.github_events import GithubPushEvent
+from test.helpers import WEBHOOK_SECRET, freeze
 
 
-@pytest.fixture
-def client():
-    """Test client for FastAPI app."""
-    return TestClient(app)
+# Repository block shared by every payload in this module, read-only since handlers only read it.
+HELLO_WORLD_REPOSITORY = freeze({
+    "id": 123456789,
+    "full_name": "octocat/Hello-World",
+    "owner": {
+        "login": "octocat",
+        "id": 1
+    },
+    "html_url": "https://github.com/octocat/Hello-World",
+    "default_branch": "main"
+})
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_webhook_payload():
-    """Sample GitHub webhook payload for pull request closed event."""
-    return {
+    """Sample GitHub webhook payload for pull request closed event, frozen at every level since the module shares it."""
+    return freeze({
         "action": "closed",
         "number": 123,
         "pull_request": {
@@ -28,47 +33,50 @@ def sample_webhook_payload():
                 "ref": "main"
             }
         },
-        "repository": {
-            "id": 123456789,
-            "full_name": "octocat/Hello-World",
-            "owner": {
-                "login": "octocat",
-                "id": 1
-            },
-            "html_url": "https://github.com/octocat/Hello-World",
-            "default_branch": "main"
-        }
-    }
+        "repository": HELLO_WORLD_REPOSITORY
+    })
 
 
-def generate_signature(payload_dict, secret="test_secret"):
+def generate_signature(payload_dict, secret=WEBHOOK_SECRET):
     """Generate a valid HMAC signature for a given payload."""
-    payload_bytes = json.dumps(payload_dict, separators=(',', ':')).encode('utf-8')
-    hash_object = hmac.new(secret.encode('utf-8'), msg=payload_bytes, digestmod=hashlib.sha256)
-    return "sha256=" + hash_object.hexdigest(), payload_bytes
+    # default=dict unwraps the read-only payload mappings
+    payload_bytes = json.dumps(payload_dict, separators=(',', ':'), default=dict).encode('utf-8')
+    # Single-shot digest: no intermediate HMAC object is built for a one-off signature
+    return "sha256=" + hmac.digest(secret.encode('utf-8'), payload_bytes, "sha256").hex(), payload_bytes
+
+
+def make_mock_request(body, headers):
+    """Build a mock Request carrying only the raw body bytes and headers, as the handler reads nothing else."""
+    return Mock(body=AsyncMock(return_value=body), headers=headers)
+
+
+def reject_payload(*args, **kwargs):
+    """Stand-in for GithubPushEvent.model_validate_json that fails validation."""
+    raise ValueError("Validation error")
 
 
+@pytest.fixture(scope="module")
+def signed_sample_webhook_payload(sample_webhook_payload):
+    """Signature and body bytes for the sample payload, computed once per module."""
+    return generate_signature(sample_webhook_payload)
+
+
+@pytest.mark.asyncio
 class TestGithubWebhook:
     """Test cases for the github_webhook function."""
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    @patch("api.web_hook.app.generate_wiki_for_repository")
-    async def test_github_webhook_valid_pull_request_merged(self, mock_generate_wiki, sample_webhook_payload):
+    async def test_github_webhook_valid_pull_request_merged(self, wiki_generation_stub, signed_sample_webhook_payload):
         """
         Tests github_webhook with a valid merged pull request to main branch.
         Should process the webhook and add background task.
         """
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(sample_webhook_payload)
+        signature, payload_bytes = signed_sample_webhook_payload
 
         # Create mock request
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
 
         # Create mock background tasks
         mock_background_tasks = Mock(spec=BackgroundTasks)
@@ -78,31 +86,27 @@ class TestGithubWebhook:
 
         # Assertions
         assert response.status_code == 202
-        assert "Processing repository octocat/Hello-World in background" in response.body.decode()
+        assert b"Processing repository octocat/Hello-World in background" in response.body
         mock_background_tasks.add_task.assert_called_once()
 
         # Verify the background task was called with correct parameters
         call_args = mock_background_tasks.add_task.call_args
-        assert call_args[0][0] == mock_generate_wiki
+        assert call_args[0][0] == wiki_generation_stub
         assert isinstance(call_args[1]["github_event"], GithubPushEvent)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_missing_signature(self, sample_webhook_payload):
+    async def test_github_webhook_missing_signature(self, signed_sample_webhook_payload):
         """
         Tests github_webhook when HMAC signature is missing from headers.
         Should raise HTTPException with 400 status code.
         """
-        # Create mock request without signature
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=json.dumps(sample_webhook_payload, separators=(',', ':')).encode('utf-8'))
+        _, payload_bytes = signed_sample_webhook_payload
 
-        # Create a proper mock headers object
+        # Create a proper mock headers object without signature
         mock_headers = Mock()
         mock_headers.get = Mock(side_effect=lambda key, default=None: {
             "X-GitHub-Event": "pull_request"
         }.get(key, default))
-        mock_request.headers = mock_headers
+        mock_request = make_mock_request(payload_bytes, mock_headers)
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -113,20 +117,19 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 400
         assert "Missing HMAC-SHA256 signature" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": ""})
-    async def test_github_webhook_missing_webhook_secret(self, sample_webhook_payload):
+    async def test_github_webhook_missing_webhook_secret(self, signed_sample_webhook_payload, monkeypatch):
         """
         Tests github_webhook when webhook secret is not configured in environment.
         Should raise HTTPException with 500 status code.
         """
+        monkeypatch.setenv("Github_WEBHOOK_SECRET", "")
+        _, payload_bytes = signed_sample_webhook_payload
+
         # Create mock request
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=json.dumps(sample_webhook_payload).encode('utf-8'))
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": "sha256=invalid_signature"
-        }
+        })
         
         mock_background_tasks = Mock(spec=BackgroundTasks)
         
@@ -137,20 +140,18 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 500
         assert "Webhook secret not configured" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_invalid_signature(self, sample_webhook_payload):
+    async def test_github_webhook_invalid_signature(self, signed_sample_webhook_payload):
         """
         Tests github_webhook with invalid HMAC signature.
         Should raise HTTPException with 403 status code.
         """
+        _, payload_bytes = signed_sample_webhook_payload
+
         # Create mock request with invalid signature
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=json.dumps(sample_webhook_payload).encode('utf-8'))
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": "sha256=invalid_signature_hash"
-        }
+        })
         
         mock_background_tasks = Mock(spec=BackgroundTasks)
         
@@ -161,155 +162,142 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 403
         assert "Request signatures didn't match" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_pull_request_not_merged(self):
+    async def test_github_webhook_wrong_signature_algorithm(self, signed_sample_webhook_payload):
         """
-        Tests github_webhook with pull request closed but not merged.
-        Should acknowledge but not process the webhook.
+        Tests github_webhook with a correct digest under a prefix other than sha256=.
+        Should raise HTTPException with 403 status code.
         """
-        payload = {
-            "action": "closed",
-            "number": 123,
-            "pull_request": {
-                "merged": False,  # Not merged
-                "base": {"ref": "main"}
-            },
-            "repository": {
-                "id": 123456789,
-                "full_name": "octocat/Hello-World",
-                "owner": {"login": "octocat", "id": 1},
-                "html_url": "https://github.com/octocat/Hello-World",
-                "default_branch": "main"
-            }
-        }
+        signature, payload_bytes = signed_sample_webhook_payload
 
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(payload)
-
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
-            "X-Hub-Signature-256": signature
-        }
+            "X-Hub-Signature-256": signature.replace("sha256=", "sha1=")
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
-        response = await github_webhook(mock_request, mock_background_tasks)
+        with pytest.raises(HTTPException) as exc_info:
+            await github_webhook(mock_request, mock_background_tasks)
 
-        assert response.status_code == 202
-        assert "event type or action is not configured for processing" in response.body.decode()
-        mock_background_tasks.add_task.assert_not_called()
+        assert exc_info.value.status_code == 403
+        assert "Request signatures didn't match" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_pull_request_different_branch(self):
+    @pytest.mark.parametrize(
+        "mangle",
+        [
+            lambda hex_digest: " ".join(hex_digest[i:i + 2] for i in range(0, len(hex_digest), 2)),
+            str.upper,
+            lambda hex_digest: hex_digest + "  ",
+            lambda hex_digest: hex_digest[:-1],
+        ],
+        ids=["whitespace_separated", "uppercase", "trailing_whitespace", "odd_length"]
+    )
+    async def test_github_webhook_malformed_signature(self, mangle, signed_sample_webhook_payload):
         """
-        Tests github_webhook with pull request merged to non-default branch.
-        Should acknowledge but not process the webhook.
+        Tests github_webhook with the correct digest in a non-canonical hex form.
+        Only exactly 64 lowercase hex characters are accepted, so each should raise HTTPException with 403.
         """
-        payload = {
-            "action": "closed",
-            "number": 123,
-            "pull_request": {
-                "merged": True,
-                "base": {"ref": "develop"}  # Different from default branch
-            },
-            "repository": {
-                "id": 123456789,
-                "full_name": "octocat/Hello-World",
-                "owner": {"login": "octocat", "id": 1},
-                "html_url": "https://github.com/octocat/Hello-World",
-                "default_branch": "main"
-            }
-        }
+        signature, payload_bytes = signed_sample_webhook_payload
+        hex_digest = signature.removeprefix("sha256=")
 
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(payload)
-
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
-            "X-Hub-Signature-256": signature
-        }
+            "X-Hub-Signature-256": "sha256=" + mangle(hex_digest)
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
-        response = await github_webhook(mock_request, mock_background_tasks)
+        with pytest.raises(HTTPException) as exc_info:
+            await github_webhook(mock_request, mock_background_tasks)
 
-        assert response.status_code == 202
-        assert "event type or action is not configured for processing" in response.body.decode()
+        assert exc_info.value.status_code == 403
         mock_background_tasks.add_task.assert_not_called()
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_different_event_type(self, sample_webhook_payload):
+    async def test_github_webhook_rotated_secret(self, sample_webhook_payload, signed_sample_webhook_payload, monkeypatch):
         """
-        Tests github_webhook with different GitHub event type (not pull_request).
-        Should acknowledge but not process the webhook.
+        Tests github_webhook after the webhook secret changes between requests.
+        The cached HMAC key for the old secret must not validate the new signature or vice versa.
         """
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(sample_webhook_payload)
+        old_signature, payload_bytes = signed_sample_webhook_payload
+        new_signature, _ = generate_signature(sample_webhook_payload, secret="rotated_secret")
 
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
-            "X-GitHub-Event": "push",  # Different event type
-            "X-Hub-Signature-256": signature
-        }
+        def signed_request(signature):
+            return make_mock_request(payload_bytes, {
+                "X-GitHub-Event": "pull_request",
+                "X-Hub-Signature-256": signature
+            })
 
-        mock_background_tasks = Mock(spec=BackgroundTasks)
-
-        response = await github_webhook(mock_request, mock_background_tasks)
+        response = await github_webhook(signed_request(old_signature), Mock(spec=BackgroundTasks))
+        assert response.status_code == 202
 
+        monkeypatch.setenv("Github_WEBHOOK_SECRET", "rotated_secret")
+        response = await github_webhook(signed_request(new_signature), Mock(spec=BackgroundTasks))
         assert response.status_code == 202
-        assert "event type or action is not configured for processing" in response.body.decode()
-        mock_background_tasks.add_task.assert_not_called()
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_different_action(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await github_webhook(signed_request(old_signature), Mock(spec=BackgroundTasks))
+        assert exc_info.value.status_code == 403
+
+    @pytest.mark.parametrize(
+        "action, merged, base_ref",
+        [
+            ("closed", False, "main"),  # Not merged
+            ("closed", True, "develop"),  # Different from default branch
+            ("opened", False, "main"),  # Different action
+        ],
+        ids=["pull_request_not_merged", "pull_request_different_branch", "different_action"]
+    )
+    async def test_github_webhook_pull_request_not_processed(self, action, merged, base_ref):
         """
-        Tests github_webhook with different action (not closed).
+        Tests github_webhook with pull requests that are not merged into the default branch.
         Should acknowledge but not process the webhook.
         """
         payload = {
-            "action": "opened",  # Different action
+            "action": action,
             "number": 123,
             "pull_request": {
-                "merged": False,
-                "base": {"ref": "main"}
+                "merged": merged,
+                "base": {"ref": base_ref}
             },
-            "repository": {
-                "id": 123456789,
-                "full_name": "octocat/Hello-World",
-                "owner": {"login": "octocat", "id": 1},
-                "html_url": "https://github.com/octocat/Hello-World",
-                "default_branch": "main"
-            }
+            "repository": HELLO_WORLD_REPOSITORY
         }
 
         # Generate valid signature for this specific payload
         signature, payload_bytes = generate_signature(payload)
 
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
+
+        mock_background_tasks = Mock(spec=BackgroundTasks)
+
+        response = await github_webhook(mock_request, mock_background_tasks)
+
+        assert response.status_code == 202
+        assert b"event type or action is not configured for processing" in response.body
+        mock_background_tasks.add_task.assert_not_called()
+
+    async def test_github_webhook_different_event_type(self, signed_sample_webhook_payload):
+        """
+        Tests github_webhook with different GitHub event type (not pull_request).
+        Should acknowledge but not process the webhook.
+        """
+        signature, payload_bytes = signed_sample_webhook_payload
+
+        mock_request = make_mock_request(payload_bytes, {
+            "X-GitHub-Event": "push",  # Different event type
+            "X-Hub-Signature-256": signature
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
         response = await github_webhook(mock_request, mock_background_tasks)
 
         assert response.status_code == 202
-        assert "event type or action is not configured for processing" in response.body.decode()
+        assert b"event type or action is not configured for processing" in response.body
         mock_background_tasks.add_task.assert_not_called()
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
     async def test_github_webhook_invalid_json(self):
         """
         Tests github_webhook with invalid JSON payload.
@@ -317,16 +305,12 @@ class TestGithubWebhook:
         """
         # Generate signature for invalid json
         invalid_json = b"invalid json"
-        hash_object = hmac.new("test_secret".encode('utf-8'), msg=invalid_json, digestmod=hashlib.sha256)
-        signature = "sha256=" + hash_object.hexdigest()
+        signature = "sha256=" + hmac.digest(WEBHOOK_SECRET.encode('utf-8'), invalid_json, "sha256").hex()
 
-        mock_request = Mock()
-        mock_request.json = AsyncMock(side_effect=json.JSONDecodeError("Invalid JSON", "", 0))
-        mock_request.body = AsyncMock(return_value=invalid_json)
-        mock_request.headers = {
+        mock_request = make_mock_request(invalid_json, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -336,26 +320,18 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 400
         assert "Invalid JSON in webhook payload" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    @patch("api.web_hook.app.GithubPushEvent")
-    async def test_github_webhook_pydantic_validation_error(self, mock_github_event, sample_webhook_payload):
+    @patch.object(GithubPushEvent, "model_validate_json", new=reject_payload)
+    async def test_github_webhook_pydantic_validation_error(self, signed_sample_webhook_payload):
         """
         Tests github_webhook when Pydantic model validation fails.
         Should raise HTTPException with 500 status code.
         """
-        # Mock Pydantic validation error
-        mock_github_event.side_effect = ValueError("Validation error")
+        signature, payload_bytes = signed_sample_webhook_payload
 
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(sample_webhook_payload)
-
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -365,25 +341,19 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 500
         assert "Internal server error" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_missing_github_event_header(self, sample_webhook_payload):
+    async def test_github_webhook_missing_github_event_header(self, signed_sample_webhook_payload):
         """
         Tests github_webhook when X-GitHub-Event header is missing.
         Should still process if other conditions are met.
         """
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(sample_webhook_payload)
-
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
+        signature, payload_bytes = signed_sample_webhook_payload
 
         # Create a proper mock headers object
         mock_headers = Mock()
         mock_headers.get = Mock(side_effect=lambda key, default=None: {
             "X-Hub-Signature-256": signature
         }.get(key, default))
-        mock_request.headers = mock_headers
+        mock_request = make_mock_request(payload_bytes, mock_headers)
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -391,9 +361,8 @@ class TestGithubWebhook:
 
         # Should acknowledge but not process since github_event_type will be None
         assert response.status_code == 202
-        assert "event type or action is not configured for processing" in response.body.decode()
+        assert b"event type or action is not configured for processing" in response.body
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
     async def test_github_webhook_empty_payload(self):
         """
         Tests github_webhook with empty payload.
@@ -404,13 +373,10 @@ class TestGithubWebhook:
         # Generate valid signature for empty payload
         signature, payload_bytes = generate_signature(empty_payload)
 
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=empty_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -420,22 +386,17 @@ class TestGithubWebhook:
         assert exc_info.value.status_code == 500
         assert "Internal server error" in str(exc_info.value.detail)
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    async def test_github_webhook_background_task_exception(self, sample_webhook_payload):
+    async def test_github_webhook_background_task_exception(self, signed_sample_webhook_payload):
         """
         Tests github_webhook when background task addition succeeds.
         The actual background task execution is tested separately.
         """
-        # Generate valid signature for this specific payload
-        signature, payload_bytes = generate_signature(sample_webhook_payload)
+        signature, payload_bytes = signed_sample_webhook_payload
 
-        mock_request = Mock()
-        mock_request.json = AsyncMock(return_value=sample_webhook_payload)
-        mock_request.body = AsyncMock(return_value=payload_bytes)
-        mock_request.headers = {
+        mock_request = make_mock_request(payload_bytes, {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": signature
-        }
+        })
 
         mock_background_tasks = Mock(spec=BackgroundTasks)
 
@@ -446,18 +407,17 @@ class TestGithubWebhook:
         mock_background_tasks.add_task.assert_called_once()
 
 
-# Integration tests using TestClient
+# Integration tests over an ASGI transport
+@pytest.mark.asyncio
 class TestGithubWebhookIntegration:
-    """Integration tests for the github_webhook endpoint using TestClient."""
+    """Integration tests for the github_webhook endpoint over HTTP."""
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    def test_webhook_endpoint_integration(self, client, sample_webhook_payload):
+    async def test_webhook_endpoint_integration(self, async_client, signed_sample_webhook_payload):
         """
         Integration test for the /webhook endpoint with valid payload.
         Tests the complete request flow through FastAPI.
         """
-        # Generate valid signature using the same method as the helper function
-        signature, _ = generate_signature(sample_webhook_payload)
+        signature, payload_bytes = signed_sample_webhook_payload
 
         headers = {
             "X-GitHub-Event": "pull_request",
@@ -465,23 +425,23 @@ class TestGithubWebhookIntegration:
             "Content-Type": "application/json"
         }
 
-        response = client.post("/webhook", json=sample_webhook_payload, headers=headers)
+        response = await async_client.post("/webhook", content=payload_bytes, headers=headers)
 
         assert response.status_code == 202
-        assert "Processing repository octocat/Hello-World in background" in response.text
+        assert b"Processing repository octocat/Hello-World in background" in response.content
 
-    @patch.dict(os.environ, {"Github_WEBHOOK_SECRET": "test_secret"})
-    def test_webhook_endpoint_invalid_signature_integration(self, client, sample_webhook_payload):
+    async def test_webhook_endpoint_invalid_signature_integration(self, async_client, signed_sample_webhook_payload):
         """
         Integration test for the /webhook endpoint with invalid signature.
         """
+        _, payload_bytes = signed_sample_webhook_payload
         headers = {
             "X-GitHub-Event": "pull_request",
             "X-Hub-Signature-256": "sha256=invalid_signature",
             "Content-Type": "application/json"
         }
 
-        response = client.post("/webhook", json=sample_webhook_payload, headers=headers)
+        response = await async_client.post("/webhook", content=payload_bytes, headers=headers)
 
         assert response.status_code == 403
-        assert "Request signatures didn't match" in response.text
+        assert b"Request signatures didn't match" in response.content
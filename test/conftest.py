@@ -2,12 +2,70 @@
 Pytest configuration and shared fixtures for webhook_autodoc tests.
 """
 import sys
-import os
 from pathlib import Path
+from unittest.mock import create_autospec
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 
 # Add the project root to Python path so imports work correctly
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Set environment variables for testing
-os.environ.setdefault("Github_WEBHOOK_SECRET", "test_secret_default")
+from api.web_hook.app import app
+from api.web_hook.services.wiki_generator import generate_wiki_for_repository
+from test.helpers import WEBHOOK_SECRET
+
+try:
+    import uvloop
+except ImportError:  # Windows, or uvicorn installed without the [standard] extra
+    uvloop = None
+
+
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop; older pytest-asyncio releases without this hook keep the default loop."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def refuse_websocket_connection(*args, **kwargs):
+    raise ConnectionRefusedError("Tests must not open a real WS_API websocket")
+
+
+@pytest.fixture(autouse=True)
+def webhook_secret(monkeypatch):
+    """Set the secret test requests are signed with, restoring only this variable afterwards."""
+    monkeypatch.setenv("Github_WEBHOOK_SECRET", WEBHOOK_SECRET)
+
+
+# Autospecced once; building it inspects the function's signature, so tests reset it instead
+GENERATE_WIKI_STUB = create_autospec(generate_wiki_for_repository)
+
+
+@pytest.fixture(autouse=True)
+def wiki_generation_stub(monkeypatch):
+    """
+    Keep webhook tests off the network.
+    TestClient runs background tasks inline, so an accepted webhook would otherwise
+    call the GitHub API and open a real websocket to WS_API. The background task is
+    replaced at its import site, and websockets.connect refuses to connect as a backstop.
+    Returns:
+        The autospecced generate_wiki_for_repository mock used by the app
+    """
+    monkeypatch.setattr("api.web_hook.services.wiki_generator.websockets.connect", refuse_websocket_connection)
+    GENERATE_WIKI_STUB.reset_mock()
+    monkeypatch.setattr("api.web_hook.app.generate_wiki_for_repository", GENERATE_WIKI_STUB)
+    return GENERATE_WIKI_STUB
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client():
+    """
+    HTTP client for the webhook app, shared by every test module in the session.
+    Requests are dispatched straight into the ASGI app on the session event loop, with no
+    portal thread; the app has no startup hooks, so no lifespan is run.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
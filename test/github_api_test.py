@@ -1,80 +1,276 @@
+import asyncio
 import pytest
+import hmac
 import json
 import os
-from unittest.mock import patch, AsyncMock
+import importlib.util
+from functools import cache
+from importlib import resources
+from types import MappingProxyType
+from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 from api.web_hook.app import app
+from api.web_hook.models.github_events import WikiPageDetail, WikiStructure
+from api.web_hook.services.wiki_generator import generate_wiki_for_repository
+from api.web_hook.utils.export_utils import export_wiki_python
+from api.web_hook.utils.xml_helpers import parse_wiki_structure
+from test.helpers import WEBHOOK_SECRET, freeze
 
-@pytest.fixture
-def test_client():
-    return TestClient(app)
-
-@pytest.fixture
-def mock_github_event():
-    return {
-        "number": 1,
-        "action": "closed",
-        "pull_request": {
-            "merged": True,
-            "base": {
-                "ref": "main"
-            }
-        },
-        "repository": {
-            "id": 1001069502,
-            "full_name": "test-owner/test-repo",
-            "private": False,
-            "owner": {
-                "login": "test-owner",
-                "id": 12345
-            },
-            "html_url": "https://github.com/test-owner/test-repo",
-            "default_branch": "main"
+# Read-only at every level so no test can mutate the event out from under the pre-serialized body below
+GITHUB_EVENT = freeze({
+    "number": 1,
+    "action": "closed",
+    "pull_request": {
+        "merged": True,
+        "base": {
+            "ref": "main"
         }
+    },
+    "repository": {
+        "id": 1001069502,
+        "full_name": "test-owner/test-repo",
+        "private": False,
+        "owner": {
+            "login": "test-owner",
+            "id": 12345
+        },
+        "html_url": "https://github.com/test-owner/test-repo",
+        "default_branch": "main"
     }
+})
+
+# Serialized once at import so each request posts the same bytes without re-encoding;
+# default=dict lets json unwrap the read-only mapping
+GITHUB_EVENT_BODY = json.dumps(GITHUB_EVENT, separators=(",", ":"), default=dict).encode("utf-8")
+
+# Real signature of the body, computed once with the single-shot HMAC helper so the app verifies it unpatched
+GITHUB_EVENT_SIGNATURE = "sha256=" + hmac.digest(WEBHOOK_SECRET.encode("utf-8"), GITHUB_EVENT_BODY, "sha256").hex()
+
+# Content-Length is fixed with the body, so it is supplied up front rather than worked out per request
+WEBHOOK_HEADERS = {
+    "X-GitHub-Event": "pull_request",
+    "X-Hub-Signature-256": GITHUB_EVENT_SIGNATURE,
+    "Content-Type": "application/json",
+    "Content-Length": str(len(GITHUB_EVENT_BODY))
+}
+
+@cache
+def load_fixture(*path):
+    """Read a file under test/fixtures once per process."""
+    return resources.files(__package__).joinpath("fixtures", *path).read_text(encoding="utf-8")
+
+def assert_accepted(response):
+    """Assert the webhook was acknowledged, reading the raw body instead of parsing it as JSON."""
+    assert response.status_code == 202
+    assert b"Webhook received" in response.content
+
+async def fake_repo_file_tree(owner, repo, default_branch):
+    return "README.md\napi/web_hook/app.py"
+
+async def fake_repo_readme(owner, repo):
+    return "# test-repo"
+
+# Replies are streamed in frames of this many characters, like the WS_API's token stream;
+# small enough that the structure reply and longer pages arrive in pieces
+WS_FRAME_SIZE = 512
+
+def split_frames(text):
+    """Split a reply into text frames, as the WS_API streams them."""
+    return tuple(text[i:i + WS_FRAME_SIZE] for i in range(0, len(text), WS_FRAME_SIZE))
+
+class FakeWebSocket:
+    """Minimal stand-in for a websockets connection that replays fixed messages."""
+
+    def __init__(self, *messages):
+        self.messages = iter(messages)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def send(self, message):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # Plain iterator protocol: no async generator frame is suspended and resumed per message
+        try:
+            return next(self.messages)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+class FakeExportSession:
+    """Stand-in for aiohttp.ClientSession that records the export POST and answers with a file download."""
+
+    def __init__(self):
+        self.posted = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def post(self, url, json=None, headers=None):
+        self.posted.append((url, json))
+        return FakeExportResponse(b'{"exported": true}')
+
+class FakeExportResponse:
+    """Successful aiohttp response carrying the exported wiki as a file download."""
+
+    ok = True
+    status = 200
+    headers = {"Content-Disposition": 'attachment; filename="test-repo_wiki.json"'}
+
+    def __init__(self, body):
+        self.body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return self.body
+
+@pytest.fixture(scope="module")
+def test_client():
+    # Entering the client runs the app's startup once; every test in the module shares it
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def wiki_structure_xml():
+    """The <wiki_structure> reply the mocked WS_API sends for the structure request."""
+    return load_fixture("wiki_structure.xml")
+
+@pytest.fixture(scope="session")
+def wiki_structure(wiki_structure_xml):
+    """WikiStructure for the fixture XML, built once with model_construct since the input is trusted."""
+    title, description, pages = parse_wiki_structure(wiki_structure_xml)
+    return WikiStructure.model_construct(
+        id="wiki-test-owner-test-repo",
+        title=title,
+        description=description,
+        pages=[WikiPageDetail.model_construct(**page) for page in pages],
+        sections=[],
+        root_sections=[]
+    )
+
+@pytest.fixture(scope="session")
+def generated_pages(wiki_structure):
+    """
+    Markdown the mocked WS_API sends for each page, keyed by page id in structure order.
+    Each page is its own fixtures/pages/<id>.md file. Read-only, since the session
+    shares one instance across tests.
+    """
+    return MappingProxyType({page.id: load_fixture("pages", f"{page.id}.md") for page in wiki_structure.pages})
+
+@pytest.fixture(scope="session")
+def ws_frames(wiki_structure_xml, generated_pages):
+    """Text frames for the structure reply followed by each page reply, built once."""
+    return (split_frames(wiki_structure_xml), *(split_frames(content) for content in generated_pages.values()))
+
+# Reused by every test that mocks WS_API; reset rather than rebuilt per test
+MOCK_WS_CONNECT = MagicMock()
 
 @pytest.fixture
-def mock_headers():
-    return {
-        "X-GitHub-Event": "pull_request",
-        "X-Hub-Signature-256": "sha256=mock_signature"
-    }
+def mock_ws_connect(ws_frames, monkeypatch, tmp_path):
+    """
+    Run the real wiki generation behind the webhook with its I/O mocked out.
+    The GitHub API helpers and websockets.connect are swapped for fakes; the mocked
+    WS_API answers the structure request and then each fixture page in order.
+    """
+    MOCK_WS_CONNECT.reset_mock()
+    # A generator side_effect is consumed as-is; each fake connection is built when it is opened
+    MOCK_WS_CONNECT.side_effect = (FakeWebSocket(*frames) for frames in ws_frames)
+    monkeypatch.setenv("WS_API", "ws://localhost:8001/ws/chat")
+    # llms.txt is written relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("api.web_hook.app.generate_wiki_for_repository", generate_wiki_for_repository)
+    monkeypatch.setattr("api.web_hook.services.wiki_generator.get_repo_file_tree", fake_repo_file_tree)
+    monkeypatch.setattr("api.web_hook.services.wiki_generator.get_repo_readme", fake_repo_readme)
+    monkeypatch.setattr("api.web_hook.services.wiki_generator.websockets.connect", MOCK_WS_CONNECT)
+    return MOCK_WS_CONNECT
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mock_ws", [False, True], ids=["stubbed_generation", "mocked_ws"])
+async def test_github_webhook(mock_ws, request, async_client, wiki_generation_stub, tmp_path):
+    # With mock_ws the real wiki generation runs against the mocked WS_API instead of the stub
+    mock_ws_connect = request.getfixturevalue("mock_ws_connect") if mock_ws else None
+
+    # Make the request to the webhook endpoint
+    response = await async_client.post(
+        "/webhook",
+        content=GITHUB_EVENT_BODY,
+        headers=WEBHOOK_HEADERS
+    )
+
+    # Verify the response
+    assert_accepted(response)
+
+    if not mock_ws:
+        # Verify the background task was added
+        wiki_generation_stub.assert_called_once()
+        return
+
+    generated_pages = request.getfixturevalue("generated_pages")
+    assert mock_ws_connect.call_count == 1 + len(generated_pages)
+
+    # The ASGI call includes background tasks, so the export already exists
+    llms_txt = (tmp_path / "repo_wiki_generations" / "llms.txt").read_text(encoding="utf-8")
+    assert "# Webhook Flow" in llms_txt
+    assert "Only merged pull requests targeting the default branch" in llms_txt
+
+# Number of webhook deliveries fired at once by the concurrency test
+CONCURRENT_DELIVERIES = 64
 
 @pytest.mark.asyncio
-async def test_github_webhook_end_to_end(test_client, mock_github_event, mock_headers):
-    # Mock the HMAC signature verification
-    with patch('api.web_hook.app.hmac.compare_digest', return_value=True):
-        # Mock the generate_wiki_for_repository function
-        with patch('api.web_hook.app.generate_wiki_for_repository') as mock_process:
-            mock_process.return_value = {
-                "wiki_structure": {
-                    "title": "Test Wiki",
-                    "description": "Test Description",
-                    "pages": [{"id": "test-page", "title": "Test Page"}]
-                },
-                "generated_pages": {
-                    "test-page": {
-                        "id": "test-page",
-                        "title": "Test Page",
-                        "content": "Test content"
-                    }
-                },
-                "repo_url": "https://github.com/test-owner/test-repo"
-            }
-            
-            # Set environment variable for webhook secret
-            os.environ["Github_WEBHOOK_SECRET"] = "test_secret"
-            
-            # Make the request to the webhook endpoint
-            response = test_client.post(
-                "/webhook",
-                json=mock_github_event,
-                headers=mock_headers
-            )
-            
-            # Verify the response
-            assert response.status_code == 202
-            assert "Webhook received" in response.json()["message"]
-            
-            # Verify the background task was added
-            mock_process.assert_called_once()
\ No newline at end of file
+async def test_github_webhook_concurrent(async_client, wiki_generation_stub):
+    # Concurrent deliveries share one loop and one client; each must verify and dispatch independently
+    responses = await asyncio.gather(*(
+        async_client.post("/webhook", content=GITHUB_EVENT_BODY, headers=WEBHOOK_HEADERS)
+        for _ in range(CONCURRENT_DELIVERIES)
+    ))
+
+    for response in responses:
+        assert_accepted(response)
+    assert wiki_generation_stub.call_count == CONCURRENT_DELIVERIES
+
+@pytest.mark.skipif(importlib.util.find_spec("pytest_benchmark") is None, reason="pytest-benchmark is not installed")
+@pytest.mark.skipif(
+    "PYTEST_XDIST_WORKER" in os.environ,
+    reason="pytest-benchmark is disabled under xdist; run serially with `python run_webhook_tests.py --benchmark`"
+)
+def test_github_webhook_latency(benchmark, test_client):
+    # Regression gate for the /webhook ingestion path: signature check, payload validation and task dispatch.
+    # Must run serially: `python run_webhook_tests.py --benchmark` fails it when the median regresses
+    # against the baseline recorded with `--benchmark-save-baseline`.
+    response = benchmark(test_client.post, "/webhook", content=GITHUB_EVENT_BODY, headers=WEBHOOK_HEADERS)
+
+    assert_accepted(response)
+
+@pytest.mark.asyncio
+async def test_export_wiki_python(wiki_structure, generated_pages, monkeypatch, tmp_path):
+    session = FakeExportSession()
+    monkeypatch.setattr("api.web_hook.utils.export_utils.aiohttp.ClientSession", lambda: session)
+    # The export is saved under downloads/ relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    pages = {page_id: {"id": page_id, "content": content} for page_id, content in generated_pages.items()}
+
+    error, save_path = await export_wiki_python(
+        wiki_structure, pages, "test-owner/test-repo", "https://github.com/test-owner/test-repo",
+        api_base_url="http://localhost:8001"
+    )
+
+    assert error is None
+    assert save_path == str(tmp_path / "downloads" / "test-repo_wiki.json")
+    url, payload = session.posted[0]
+    assert url == "http://localhost:8001/export/wiki"
+    assert [page["id"] for page in payload["pages"]] == list(generated_pages)
+    assert payload["pages"][1]["content"] == generated_pages["webhook-flow"]
@@ -0,0 +1,15 @@
+"""
+Helpers shared by the webhook_autodoc test modules.
+"""
+from types import MappingProxyType
+
+# Secret every test request is signed with; conftest sets it for the app before each test
+WEBHOOK_SECRET = "test_secret"
+
+
+def freeze(mapping):
+    """Read-only view of a mapping, with every nested dict frozen the same way."""
+    return MappingProxyType({
+        key: freeze(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })